@@ -27,7 +27,7 @@ Example usage:
         transport.reboot()
 """
 
-from .cobs import cobs_encode, cobs_decode
+from .cobs import cobs_encode, cobs_encode_into, cobs_decode
 from .crc32 import crc32
 from .protocol import (
     Command,
@@ -59,6 +59,7 @@ __version__ = "0.1.0"
 __all__ = [
     # COBS
     "cobs_encode",
+    "cobs_encode_into",
     "cobs_decode",
     # CRC
     "crc32",
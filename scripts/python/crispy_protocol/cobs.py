@@ -20,29 +20,43 @@ def cobs_encode(data: bytes) -> bytes:
         COBS-encoded bytes (without delimiter)
     """
     output = bytearray()
-    code_idx = 0
-    code = 1
-    output.append(0)  # Placeholder for first code byte
-
-    for byte in data:
-        if byte == 0:
-            output[code_idx] = code
-            code_idx = len(output)
-            output.append(0)  # Placeholder
-            code = 1
-        else:
-            output.append(byte)
-            code += 1
-            if code == 255:
-                output[code_idx] = code
-                code_idx = len(output)
-                output.append(0)  # Placeholder
-                code = 1
-
-    output[code_idx] = code
+    cobs_encode_into(data, output)
     return bytes(output)
 
 
+def cobs_encode_into(data: bytes, out: bytearray) -> None:
+    """
+    Encode data using COBS, appending to an existing buffer.
+
+    Writing into a caller-supplied bytearray lets framing code build a
+    full packet (encoded payload plus delimiter) with one allocation
+    instead of concatenating intermediate bytes objects.
+
+    Args:
+        data: Raw bytes to encode
+        out: Buffer the encoded bytes are appended to
+    """
+    # Fast path: short zero-free data (the common case for firmware
+    # chunks' command headers) encodes as one code byte plus the data
+    # verbatim — the find() is a single C scan. Strictly below 254:
+    # a full 254-byte group also gets a trailing code byte.
+    if len(data) < 254 and data.find(b'\x00') < 0:
+        out.append(len(data) + 1)
+        out += data
+        return
+
+    # Zero bytes delimit runs of non-zero data, so let bytes.split find
+    # them in one C pass; Python only iterates over the runs (few per
+    # packet) instead of every byte.
+    for segment in data.split(b'\x00'):
+        while len(segment) >= 254:
+            out.append(0xFF)
+            out += segment[:254]
+            segment = segment[254:]
+        out.append(len(segment) + 1)
+        out += segment
+
+
 def cobs_decode(data: bytes) -> bytes:
     """
     Decode COBS-encoded data.
@@ -65,11 +79,11 @@ def cobs_decode(data: bytes) -> bytes:
             break  # Delimiter
         i += 1
 
-        for _ in range(1, code):
-            if i >= len(data):
-                raise ValueError("COBS decode: unexpected end of data")
-            output.append(data[i])
-            i += 1
+        run_len = code - 1
+        if i + run_len > len(data):
+            raise ValueError("COBS decode: unexpected end of data")
+        output += data[i:i + run_len]
+        i += run_len
 
         if code < 255 and i < len(data) and data[i] != 0:
             output.append(0)
@@ -5,17 +5,31 @@
 CRC-32 (ISO HDLC / IEEE 802.3) implementation.
 
 This is the same CRC-32 algorithm used by the bootloader for
-firmware integrity verification.
+firmware integrity verification. The hot path delegates to
+zlib.crc32, which computes the identical polynomial (0xEDB88320)
+in C; the table-driven pure-Python version is kept as a reference
+mirroring the bootloader's Rust implementation.
 """
 
-# Pre-computed CRC-32 lookup table
-_CRC32_TABLE = []
+import functools
+import zlib
+from array import array
 
+# Optional hardware-accelerated CRC-32C (SSE4.2 / ARMv8 CRC instructions).
+# Only relevant if the bootloader ever switches to the Castagnoli
+# polynomial; the wire protocol today is plain CRC-32 (ISO HDLC).
+try:
+    from crc32c import crc32c as _crc32c_hw
+    HAVE_CRC32C = True
+except ImportError:
+    _crc32c_hw = None
+    HAVE_CRC32C = False
 
+@functools.cache
 def _init_table():
-    """Initialize the CRC-32 lookup table."""
-    global _CRC32_TABLE
+    """Build (once) the CRC-32 lookup table."""
     poly = 0xEDB88320
+    table = array('I')
     for i in range(256):
         crc = i
         for _ in range(8):
@@ -23,10 +37,36 @@ def _init_table():
                 crc = (crc >> 1) ^ poly
             else:
                 crc >>= 1
-        _CRC32_TABLE.append(crc)
+        table.append(crc)
+    return table
 
 
-_init_table()
+# Pre-computed CRC-32 lookup table (reference; mirrors the bootloader's
+# table). Stored as a native uint32 array: indexing returns an unboxed
+# int faster than list[int] and the table is immutable in practice.
+_CRC32_TABLE = _init_table()
+
+
+@functools.cache
+def _init_sb8_tables():
+    """
+    Build the eight slicing-by-8 tables from the base table.
+
+    T[0] is the standard byte-at-a-time table; T[k][i] extends the CRC
+    of byte i by k additional zero bytes, allowing 8 input bytes to be
+    folded per iteration.
+    """
+    tables = [_CRC32_TABLE]
+    for k in range(1, 8):
+        prev = tables[k - 1]
+        tables.append(array(
+            'I',
+            (_CRC32_TABLE[prev[i] & 0xFF] ^ (prev[i] >> 8) for i in range(256)),
+        ))
+    return tables
+
+
+_SB8_TABLES = _init_sb8_tables()
 
 
 def crc32(data: bytes) -> int:
@@ -39,7 +79,98 @@ def crc32(data: bytes) -> int:
     Returns:
         32-bit CRC value
     """
+    return zlib.crc32(data) & 0xFFFFFFFF
+
+
+def _crc32_py(data: bytes) -> int:
+    """
+    Pure-Python reference implementation (byte-at-a-time table lookup).
+
+    Matches the bootloader's Rust implementation; kept for environments
+    where zlib is unavailable and as a cross-check in tests.
+    """
+    table = _CRC32_TABLE  # Local binding: skip a global lookup per byte
+    crc = 0xFFFFFFFF
+    for byte in data:
+        crc = table[(crc ^ byte) & 0xFF] ^ (crc >> 8)
+    return crc ^ 0xFFFFFFFF
+
+
+def _crc32_sb8(data: bytes) -> int:
+    """
+    Slicing-by-8 fallback (8 bytes folded per iteration).
+
+    Roughly 4x faster than the byte-at-a-time loop while staying pure
+    Python; the path to use if the bootloader ever switches to a
+    polynomial that zlib cannot compute.
+    """
+    t0, t1, t2, t3, t4, t5, t6, t7 = _SB8_TABLES
+    crc = 0xFFFFFFFF
+    n = len(data)
+    tail = n & 7
+    for i in range(0, n - tail, 8):
+        crc ^= (
+            data[i]
+            | (data[i + 1] << 8)
+            | (data[i + 2] << 16)
+            | (data[i + 3] << 24)
+        )
+        crc = (
+            t7[crc & 0xFF]
+            ^ t6[(crc >> 8) & 0xFF]
+            ^ t5[(crc >> 16) & 0xFF]
+            ^ t4[(crc >> 24) & 0xFF]
+            ^ t3[data[i + 4]]
+            ^ t2[data[i + 5]]
+            ^ t1[data[i + 6]]
+            ^ t0[data[i + 7]]
+        )
+    for i in range(n - tail, n):
+        crc = t0[(crc ^ data[i]) & 0xFF] ^ (crc >> 8)
+    return crc ^ 0xFFFFFFFF
+
+
+# CRC-32C (Castagnoli) polynomial, reflected form
+_CRC32C_POLY = 0x82F63B78
+
+
+@functools.cache
+def _init_crc32c_table():
+    """Build (once) the CRC-32C lookup table.
+
+    Only built on the first crc32c() call without the hardware package;
+    functools.cache makes every later call free.
+    """
+    table = array('I')
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            if crc & 1:
+                crc = (crc >> 1) ^ _CRC32C_POLY
+            else:
+                crc >>= 1
+        table.append(crc)
+    return table
+
+
+def crc32c(data: bytes) -> int:
+    """
+    Compute CRC-32C (Castagnoli) checksum.
+
+    Uses the hardware-accelerated crc32c package when installed,
+    otherwise a table-driven pure-Python fallback.
+
+    Args:
+        data: Bytes to compute checksum for
+
+    Returns:
+        32-bit CRC value
+    """
+    if _crc32c_hw is not None:
+        return _crc32c_hw(data) & 0xFFFFFFFF
+
+    table = _init_crc32c_table()
     crc = 0xFFFFFFFF
     for byte in data:
-        crc = _CRC32_TABLE[(crc ^ byte) & 0xFF] ^ (crc >> 8)
+        crc = table[(crc ^ byte) & 0xFF] ^ (crc >> 8)
     return crc ^ 0xFFFFFFFF
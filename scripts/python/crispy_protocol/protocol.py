@@ -12,7 +12,7 @@ from dataclasses import dataclass
 from enum import IntEnum
 from typing import Union
 
-from .cobs import cobs_encode, cobs_decode
+from .cobs import cobs_encode_into, cobs_decode
 from .varint import encode_varint, decode_varint
 
 
@@ -123,10 +123,18 @@ class StatusResponse:
 # Type alias for any response
 ResponseType = Union[AckResponse, StatusResponse]
 
+# One shared AckResponse per status: the ACK path runs once per data
+# block during an upload, so skip the per-frame enum lookup and
+# dataclass construction.
+_ACK_CACHE = [AckResponse(status=status) for status in AckStatus]
+
+# Plain dict lookup beats EnumMeta.__call__ on the decode path
+_BOOT_STATE_BY_VALUE = {state.value: state for state in BootState}
+
 
 def encode_get_status() -> bytes:
     """Encode a GetStatus command."""
-    return _frame(bytes([CommandType.GET_STATUS]))
+    return _GET_STATUS_FRAME
 
 
 def encode_start_update(bank: int, size: int, crc32: int, version: int) -> bytes:
@@ -141,24 +149,24 @@ def encode_start_update(bank: int, size: int, crc32: int, version: int) -> bytes
 
 
 def encode_data_block(offset: int, data: bytes) -> bytes:
-    """Encode a DataBlock command."""
-    payload = (
-        bytes([CommandType.DATA_BLOCK])
-        + encode_varint(offset)
-        + encode_varint(len(data))
-        + data
-    )
+    """Encode a DataBlock command (data may be any bytes-like object)."""
+    payload = b''.join((
+        bytes([CommandType.DATA_BLOCK]),
+        encode_varint(offset),
+        encode_varint(len(data)),
+        data,
+    ))
     return _frame(payload)
 
 
 def encode_finish_update() -> bytes:
     """Encode a FinishUpdate command."""
-    return _frame(bytes([CommandType.FINISH_UPDATE]))
+    return _FINISH_UPDATE_FRAME
 
 
 def encode_reboot() -> bytes:
     """Encode a Reboot command."""
-    return _frame(bytes([CommandType.REBOOT]))
+    return _REBOOT_FRAME
 
 
 def encode_set_active_bank(bank: int) -> bytes:
@@ -168,7 +176,7 @@ def encode_set_active_bank(bank: int) -> bytes:
 
 def encode_wipe_all() -> bytes:
     """Encode a WipeAll command."""
-    return _frame(bytes([CommandType.WIPE_ALL]))
+    return _WIPE_ALL_FRAME
 
 
 def decode_response(data: bytes) -> ResponseType:
@@ -198,7 +206,10 @@ def decode_response(data: bytes) -> ResponseType:
     if resp_type == 0:  # Ack
         if len(decoded) < 2:
             raise ValueError("Truncated Ack response")
-        return AckResponse(status=AckStatus(decoded[1]))
+        status = decoded[1]
+        if status < len(_ACK_CACHE):
+            return _ACK_CACHE[status]
+        return AckResponse(status=AckStatus(status))
 
     elif resp_type == 1:  # Status
         if len(decoded) < 2:
@@ -211,7 +222,12 @@ def decode_response(data: bytes) -> ResponseType:
 
         if offset >= len(decoded):
             raise ValueError("Truncated Status response")
-        state = BootState(decoded[offset])
+        try:
+            state = _BOOT_STATE_BY_VALUE[decoded[offset]]
+        except KeyError:
+            raise ValueError(
+                f"{decoded[offset]} is not a valid BootState"
+            ) from None
 
         return StatusResponse(
             active_bank=active_bank,
@@ -226,4 +242,15 @@ def decode_response(data: bytes) -> ResponseType:
 
 def _frame(data: bytes) -> bytes:
     """Apply COBS encoding and add delimiter."""
-    return cobs_encode(data) + b'\x00'
+    packet = bytearray()
+    cobs_encode_into(data, packet)
+    packet.append(0)
+    return bytes(packet)
+
+
+# The no-argument commands always produce the same bytes; frame them
+# once at import so the per-call cost is a name lookup.
+_GET_STATUS_FRAME = _frame(bytes([CommandType.GET_STATUS]))
+_FINISH_UPDATE_FRAME = _frame(bytes([CommandType.FINISH_UPDATE]))
+_REBOOT_FRAME = _frame(bytes([CommandType.REBOOT]))
+_WIPE_ALL_FRAME = _frame(bytes([CommandType.WIPE_ALL]))
@@ -7,7 +7,10 @@ Transport layer for crispy bootloader communication.
 Handles serial port communication with COBS framing.
 """
 
+import mmap
 import time
+import zlib
+from collections import deque
 from pathlib import Path
 from typing import Callable, Optional
 
@@ -15,6 +18,7 @@ import serial
 
 from .crc32 import crc32
 from .protocol import (
+    CommandType,
     ResponseType,
     AckResponse,
     StatusResponse,
@@ -25,7 +29,9 @@ from .protocol import (
     encode_data_block,
     encode_finish_update,
     encode_reboot,
+    _frame,
 )
+from .varint import encode_varint
 
 
 class TransportError(Exception):
@@ -62,6 +68,8 @@ class Transport:
         port: str,
         baudrate: int = 115200,
         timeout: float = 5.0,
+        settle_delay: float = 0.1,
+        probe: bool = False,
     ):
         """
         Open a connection to the bootloader.
@@ -70,9 +78,30 @@ class Transport:
             port: Serial port path (e.g., "/dev/ttyACM0")
             baudrate: Baud rate (default 115200)
             timeout: Read timeout in seconds (default 5.0)
+            settle_delay: Seconds to wait after opening the port for the
+                device to settle (default 0.1; 0 skips the wait)
+            probe: Sense readiness with short GetStatus probes instead
+                of sleeping (overrides settle_delay)
         """
         self._ser = serial.Serial(port, baudrate, timeout=timeout)
-        time.sleep(0.1)  # Let the device settle
+        if probe:
+            self._probe_ready()
+        elif settle_delay > 0:
+            time.sleep(settle_delay)  # Let the device settle
+
+    def _probe_ready(self, attempts: int = 3, probe_timeout: float = 0.05):
+        """Poll the bootloader with short-timeout GetStatus probes."""
+        original_timeout = self._ser.timeout
+        self._ser.timeout = probe_timeout
+        try:
+            for _ in range(attempts):
+                try:
+                    self._send_recv(encode_get_status())
+                    return
+                except (TimeoutError, ValueError):
+                    continue
+        finally:
+            self._ser.timeout = original_timeout
 
     def __enter__(self):
         return self
@@ -86,36 +115,69 @@ class Transport:
         if self._ser and self._ser.is_open:
             self._ser.close()
 
+    def reconnect(self, settle_delay: float = 0.1):
+        """
+        Close and reopen the same serial port.
+
+        Useful after a device reset that tears down the USB connection
+        while the port path stays valid.
+
+        Args:
+            settle_delay: Seconds to wait after reopening (0 skips)
+        """
+        port = self._ser.port
+        baudrate = self._ser.baudrate
+        timeout = self._ser.timeout
+        self.close()
+        self._ser = serial.Serial(port, baudrate, timeout=timeout)
+        if settle_delay > 0:
+            time.sleep(settle_delay)
+
     @property
     def port(self) -> str:
         """Return the serial port name."""
         return self._ser.port
 
     def _send(self, data: bytes):
-        """Send raw bytes."""
+        """Send raw bytes (buffered; no explicit drain)."""
         self._ser.write(data)
+
+    def flush(self):
+        """Drain the OS transmit buffer."""
         self._ser.flush()
 
+    def discard_input(self):
+        """Discard any unread bytes in the OS receive buffer."""
+        self._ser.reset_input_buffer()
+
     def _receive(self) -> bytes:
         """Receive bytes until 0x00 delimiter."""
-        result = bytearray()
-        while True:
-            byte = self._ser.read(1)
-            if not byte:
-                raise TimeoutError("Timeout waiting for response")
-            result.append(byte[0])
-            if byte[0] == 0:
-                break
-        return bytes(result)
+        # read_until scans for the delimiter in C with bulk reads, instead
+        # of one read() syscall per byte.
+        data = self._ser.read_until(b'\x00')
+        if not data or data[-1] != 0:
+            raise TimeoutError("Timeout waiting for response")
+        return data
 
     def _send_recv(self, data: bytes) -> ResponseType:
         """Send data and receive response."""
-        self._send(data)
+        # One buffered write plus one delimiter-bounded read per exchange;
+        # no flush in between — the read is the synchronization point.
+        self._ser.write(data)
         return decode_response(self._receive())
 
     def send(self, data: bytes) -> None:
-        """Send a pre-encoded command."""
+        """Send a pre-encoded command and drain the transmit buffer."""
         self._send(data)
+        self.flush()
+
+    def _drain_inflight(self, count: int):
+        """Best-effort read of responses for blocks still in flight."""
+        for _ in range(count):
+            try:
+                self._receive()
+            except TransportError:
+                break
 
     def receive(self) -> ResponseType:
         """Receive and decode a response."""
@@ -203,7 +265,9 @@ class Transport:
         version: int,
         chunk_size: int = 1024,
         progress_callback: Optional[Callable[[int, int], None]] = None,
-    ) -> None:
+        checksum: Optional[int] = None,
+        pipeline_depth: int = 4,
+    ) -> int:
         """
         Upload firmware to a bank.
 
@@ -213,31 +277,70 @@ class Transport:
             version: Firmware version number
             chunk_size: Size of data chunks (default 1024)
             progress_callback: Optional callback(bytes_sent, total_bytes)
+            checksum: Precomputed CRC-32 of firmware (computed if None)
+            pipeline_depth: Max data blocks in flight before waiting
+                for an ACK (1 = strict ping-pong)
+
+        Returns:
+            CRC-32 checksum of the firmware
 
         Raises:
             UploadError: If upload fails
         """
         size = len(firmware)
-        checksum = crc32(firmware)
+        # StartUpdate carries the CRC, so it must be complete before the
+        # first byte goes out — the checksum pass cannot be overlapped
+        # with TX under this protocol. It runs in C (zlib) and is
+        # negligible next to the transfer itself.
+        if checksum is None:
+            checksum = crc32(firmware)
 
         # Start update
         resp = self.start_update(bank, size, checksum, version)
         if not resp.is_ok:
             raise UploadError(f"StartUpdate failed: {resp.status}")
 
-        # Send data blocks
+        # Send data blocks, keeping up to pipeline_depth blocks in flight
+        # so serial TX overlaps with the bootloader's ACK turnaround
+        # instead of stalling a full round-trip per chunk.
+        # The command prefix and the length varint are constant for every
+        # full-size chunk, so encode them once; only the final short chunk
+        # falls back to encode_data_block.
+        cmd_prefix = bytes([CommandType.DATA_BLOCK])
+        len_varint = encode_varint(chunk_size)
+
+        # Slice through a memoryview so each chunk is an O(1) view of the
+        # firmware buffer instead of a fresh 1 KiB copy.
+        mv = memoryview(firmware)
+
+        inflight = deque()
         offset = 0
-        while offset < size:
-            chunk = firmware[offset:offset + chunk_size]
-            resp = self.send_data_block(offset, chunk)
+        while offset < size or inflight:
+            while offset < size and len(inflight) < pipeline_depth:
+                chunk = mv[offset:offset + chunk_size]
+                if len(chunk) == chunk_size:
+                    packet = _frame(b''.join(
+                        (cmd_prefix, encode_varint(offset), len_varint, chunk)
+                    ))
+                else:
+                    packet = encode_data_block(offset, chunk)
+                self._send(packet)
+                inflight.append((offset, len(chunk)))
+                offset += len(chunk)
+
+            blk_offset, blk_len = inflight.popleft()
+            resp = self.receive()
+            if not isinstance(resp, AckResponse):
+                raise ProtocolError(f"Expected AckResponse, got {type(resp).__name__}")
 
             if not resp.is_ok:
-                raise UploadError(f"DataBlock failed at offset {offset}: {resp.status}")
-
-            offset += len(chunk)
+                self._drain_inflight(len(inflight))
+                raise UploadError(
+                    f"DataBlock failed at offset {blk_offset}: {resp.status}"
+                )
 
             if progress_callback:
-                progress_callback(offset, size)
+                progress_callback(blk_offset + blk_len, size)
 
         # Finish update
         resp = self.finish_update()
@@ -246,6 +349,8 @@ class Transport:
                 raise UploadError("CRC verification failed")
             raise UploadError(f"FinishUpdate failed: {resp.status}")
 
+        return checksum
+
     def upload_firmware_file(
         self,
         path: Path,
@@ -271,6 +376,26 @@ class Transport:
             UploadError: If upload fails
             FileNotFoundError: If firmware file not found
         """
-        firmware = Path(path).read_bytes()
-        self.upload_firmware(firmware, bank, version, chunk_size, progress_callback)
-        return crc32(firmware)
+        # Map the file instead of copying it into a bytes object: the CRC
+        # pass and the chunk slicing read straight from the page cache, so
+        # no firmware-sized heap allocation is made. The precomputed
+        # checksum is handed to upload_firmware so the data is only walked
+        # once more for TX.
+        with open(path, "rb") as f:
+            try:
+                firmware = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped; upload degenerates anyway
+                firmware = b""
+
+        if isinstance(firmware, bytes):
+            return self.upload_firmware(
+                firmware, bank, version, chunk_size, progress_callback,
+            )
+
+        with firmware:
+            checksum = zlib.crc32(firmware) & 0xFFFFFFFF
+            return self.upload_firmware(
+                firmware, bank, version, chunk_size, progress_callback,
+                checksum=checksum,
+            )
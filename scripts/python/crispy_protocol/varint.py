@@ -23,6 +23,19 @@ def encode_varint(value: int) -> bytes:
     if value < 0:
         raise ValueError("Cannot encode negative value as varint")
 
+    # Unrolled fast paths: offsets and lengths in the upload protocol are
+    # almost always 1-3 byte varints, so skip the list-building loop.
+    if value < 0x80:
+        return bytes((value,))
+    if value < 0x4000:
+        return bytes((0x80 | (value & 0x7F), value >> 7))
+    if value < 0x200000:
+        return bytes((
+            0x80 | (value & 0x7F),
+            0x80 | ((value >> 7) & 0x7F),
+            value >> 14,
+        ))
+
     result = []
     while value >= 0x80:
         result.append((value & 0x7F) | 0x80)
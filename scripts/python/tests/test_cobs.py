@@ -4,118 +4,96 @@
 """Tests for COBS encoding/decoding."""
 
 import pytest
-from crispy_protocol.cobs import cobs_encode, cobs_decode
 
 
-class TestCobsEncode:
-    """Tests for cobs_encode function."""
-
-    def test_empty_data(self):
-        """Empty input produces single byte output."""
-        assert cobs_encode(b"") == b"\x01"
+@pytest.fixture(scope="module")
+def cobs():
+    """Import the module under test lazily, once per test module.
 
-    def test_single_nonzero_byte(self):
-        """Single non-zero byte."""
-        assert cobs_encode(b"\x11") == b"\x02\x11"
+    Keeps collection (and xdist workers that never run these tests)
+    from paying the import at conftest/collection time.
+    """
+    from crispy_protocol import cobs
 
-    def test_single_zero_byte(self):
-        """Single zero byte."""
-        assert cobs_encode(b"\x00") == b"\x01\x01"
+    return cobs
 
-    def test_multiple_zeros(self):
-        """Multiple consecutive zeros."""
-        assert cobs_encode(b"\x00\x00") == b"\x01\x01\x01"
-        assert cobs_encode(b"\x00\x00\x00") == b"\x01\x01\x01\x01"
+# Known (plain, encoded) pairs; each drives one encode and one decode
+# case. The last pair is the standard COBS example from Wikipedia.
+COBS_VECTORS = [
+    (b"", b"\x01"),
+    (b"\x11", b"\x02\x11"),
+    (b"\x00", b"\x01\x01"),
+    (b"\x00\x00", b"\x01\x01\x01"),
+    (b"\x00\x00\x00", b"\x01\x01\x01\x01"),
+    (b"\x11\x22\x33", b"\x04\x11\x22\x33"),
+    (b"\x00\x11\x22", b"\x01\x03\x11\x22"),
+    (b"\x11\x22\x00", b"\x03\x11\x22\x01"),
+    (b"\x11\x00\x22", b"\x02\x11\x02\x22"),
+    (b"\x11\x22\x00\x33", b"\x03\x11\x22\x02\x33"),
+]
 
-    def test_no_zeros(self):
-        """Data without zeros."""
-        assert cobs_encode(b"\x11\x22\x33") == b"\x04\x11\x22\x33"
 
-    def test_zero_at_start(self):
-        """Zero at the beginning."""
-        assert cobs_encode(b"\x00\x11\x22") == b"\x01\x03\x11\x22"
-
-    def test_zero_at_end(self):
-        """Zero at the end."""
-        assert cobs_encode(b"\x11\x22\x00") == b"\x03\x11\x22\x01"
-
-    def test_zero_in_middle(self):
-        """Zero in the middle."""
-        assert cobs_encode(b"\x11\x00\x22") == b"\x02\x11\x02\x22"
+class TestCobsEncode:
+    """Tests for cobs_encode function."""
 
-    def test_standard_example(self):
-        """Standard COBS example from Wikipedia."""
-        # [0x11, 0x22, 0x00, 0x33] -> [0x03, 0x11, 0x22, 0x02, 0x33]
-        assert cobs_encode(b"\x11\x22\x00\x33") == b"\x03\x11\x22\x02\x33"
+    @pytest.mark.parametrize("plain,encoded", COBS_VECTORS)
+    def test_encode(self, cobs, plain, encoded):
+        """Encoding known vectors."""
+        assert cobs.cobs_encode(plain) == encoded
 
-    def test_254_bytes_no_zero(self):
+    def test_254_bytes_no_zero(self, cobs):
         """254 bytes without zeros (max before code rollover)."""
         data = bytes(range(1, 255))  # 1-254
-        encoded = cobs_encode(data)
+        encoded = cobs.cobs_encode(data)
         assert encoded[0] == 255  # Code for 254 bytes + implicit zero
         assert encoded[1:255] == data
 
-    def test_255_bytes_triggers_rollover(self):
+    def test_255_bytes_triggers_rollover(self, cobs):
         """255 bytes triggers code byte rollover."""
         data = bytes([0x01] * 255)
-        encoded = cobs_encode(data)
+        encoded = cobs.cobs_encode(data)
         # First code byte is 0xFF (254 data bytes follow)
         assert encoded[0] == 255
         # Then another code byte for remaining byte
         assert encoded[255] == 2  # 1 more data byte
 
-    def test_long_data_with_zeros(self):
+    def test_long_data_with_zeros(self, cobs):
         """Long data with zeros interspersed."""
         data = b"\x01\x02\x03\x00\x04\x05\x00\x06"
-        encoded = cobs_encode(data)
-        decoded = cobs_decode(encoded)
+        encoded = cobs.cobs_encode(data)
+        decoded = cobs.cobs_decode(encoded)
         assert decoded == data
 
 
 class TestCobsDecode:
     """Tests for cobs_decode function."""
 
-    def test_empty_produces_empty(self):
-        """Decoding minimal encoding produces empty."""
-        assert cobs_decode(b"\x01") == b""
-
-    def test_single_nonzero_byte(self):
-        """Decode single non-zero byte."""
-        assert cobs_decode(b"\x02\x11") == b"\x11"
-
-    def test_single_zero_byte(self):
-        """Decode single zero byte."""
-        assert cobs_decode(b"\x01\x01") == b"\x00"
-
-    def test_multiple_zeros(self):
-        """Decode multiple zeros."""
-        assert cobs_decode(b"\x01\x01\x01") == b"\x00\x00"
-
-    def test_standard_example(self):
-        """Standard COBS example."""
-        assert cobs_decode(b"\x03\x11\x22\x02\x33") == b"\x11\x22\x00\x33"
+    @pytest.mark.parametrize("plain,encoded", COBS_VECTORS)
+    def test_decode(self, cobs, plain, encoded):
+        """Decoding known vectors."""
+        assert cobs.cobs_decode(encoded) == plain
 
-    def test_with_trailing_delimiter(self):
+    def test_with_trailing_delimiter(self, cobs):
         """Decode with trailing 0x00 delimiter."""
-        assert cobs_decode(b"\x02\x11\x00") == b"\x11"
+        assert cobs.cobs_decode(b"\x02\x11\x00") == b"\x11"
 
-    def test_stops_at_delimiter(self):
+    def test_stops_at_delimiter(self, cobs):
         """Decoding stops at 0x00 delimiter."""
         # Extra data after delimiter is ignored
-        assert cobs_decode(b"\x02\x11\x00\xFF\xFF") == b"\x11"
+        assert cobs.cobs_decode(b"\x02\x11\x00\xFF\xFF") == b"\x11"
 
-    def test_truncated_data_raises(self):
+    def test_truncated_data_raises(self, cobs):
         """Truncated data raises ValueError."""
         with pytest.raises(ValueError, match="unexpected end of data"):
-            cobs_decode(b"\x05\x11\x22")  # Code says 4 more bytes, only 2
+            cobs.cobs_decode(b"\x05\x11\x22")  # Code says 4 more bytes, only 2
 
-    def test_empty_input(self):
+    def test_empty_input(self, cobs):
         """Empty input returns empty output."""
-        assert cobs_decode(b"") == b""
+        assert cobs.cobs_decode(b"") == b""
 
-    def test_only_delimiter(self):
+    def test_only_delimiter(self, cobs):
         """Only delimiter returns empty."""
-        assert cobs_decode(b"\x00") == b""
+        assert cobs.cobs_decode(b"\x00") == b""
 
 
 class TestCobsRoundtrip:
@@ -134,20 +112,20 @@ class TestCobsRoundtrip:
         bytes([0x00] * 100),
         bytes([0xFF] * 100),
     ])
-    def test_roundtrip(self, data):
+    def test_roundtrip(self, cobs, data):
         """Encode then decode returns original data."""
-        encoded = cobs_encode(data)
-        decoded = cobs_decode(encoded)
+        encoded = cobs.cobs_encode(data)
+        decoded = cobs.cobs_decode(encoded)
         assert decoded == data
 
-    def test_roundtrip_large_data(self):
+    def test_roundtrip_large_data(self, cobs):
         """Roundtrip with large data."""
         data = bytes(range(256)) * 10  # 2560 bytes
-        encoded = cobs_encode(data)
-        decoded = cobs_decode(encoded)
+        encoded = cobs.cobs_encode(data)
+        decoded = cobs.cobs_decode(encoded)
         assert decoded == data
 
-    def test_no_zeros_in_encoded(self):
+    def test_no_zeros_in_encoded(self, cobs):
         """Encoded data never contains 0x00."""
         test_cases = [
             b"\x00" * 100,
@@ -155,5 +133,5 @@ class TestCobsRoundtrip:
             b"test\x00data\x00here",
         ]
         for data in test_cases:
-            encoded = cobs_encode(data)
+            encoded = cobs.cobs_encode(data)
             assert 0 not in encoded
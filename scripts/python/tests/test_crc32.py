@@ -5,91 +5,151 @@
 
 import pytest
 import zlib
-from crispy_protocol.crc32 import crc32, _CRC32_TABLE, _init_table
+
+
+@pytest.fixture(scope="module")
+def crc():
+    """Import the module under test lazily, once per test module.
+
+    Keeps collection (and xdist workers that never run these tests)
+    from paying the import at conftest/collection time.
+    """
+    import importlib
+
+    # Note: the package re-exports the crc32 *function* under the same
+    # name, so the submodule has to be imported explicitly.
+    return importlib.import_module("crispy_protocol.crc32")
 
 
 class TestCrc32:
     """Tests for crc32 function."""
 
-    def test_empty_data(self):
+    def test_empty_data(self, crc):
         """CRC of empty data."""
-        assert crc32(b"") == 0x00000000
-
-    def test_single_byte(self):
-        """CRC of single byte."""
-        # Verified against zlib.crc32
-        assert crc32(b"\x00") == zlib.crc32(b"\x00") & 0xFFFFFFFF
-        assert crc32(b"\xFF") == zlib.crc32(b"\xFF") & 0xFFFFFFFF
-        assert crc32(b"A") == zlib.crc32(b"A") & 0xFFFFFFFF
+        assert crc.crc32(b"") == 0x00000000
 
-    def test_known_values(self):
-        """Known CRC-32 test vectors."""
+    def test_known_values(self, crc):
+        """Known CRC-32 test vector."""
         # "123456789" is a standard test vector
-        assert crc32(b"123456789") == 0xCBF43926
+        assert crc.crc32(b"123456789") == 0xCBF43926
+
+    @pytest.mark.parametrize("data", [
+        b"",
+        b"\x00",
+        b"\xFF",
+        b"A",
+        b"123456789",
+        b"test",
+        b"hello",
+        b"Hello, World!",
+        bytes(range(256)),
+        b"\x00" * 100,
+        b"\xFF" * 100,
+        bytes(range(256)) * 1000,
+    ], ids=[
+        "empty", "nul", "ff", "A", "stdvec", "test", "hello",
+        "greeting", "all-bytes", "100-nul", "100-ff", "256KB",
+    ])
+    def test_matches_zlib(self, crc, data):
+        """Our CRC-32 matches Python's zlib implementation."""
+        assert crc.crc32(data) == zlib.crc32(data) & 0xFFFFFFFF
 
-        # Other known values
-        assert crc32(b"test") == zlib.crc32(b"test") & 0xFFFFFFFF
-        assert crc32(b"hello") == zlib.crc32(b"hello") & 0xFFFFFFFF
+    def test_incremental_differs(self, crc):
+        """Different data produces different CRC."""
+        assert crc.crc32(b"test1") != crc.crc32(b"test2")
+        assert crc.crc32(b"\x00") != crc.crc32(b"\x01")
 
-    def test_matches_zlib(self):
-        """Our CRC-32 matches Python's zlib implementation."""
+    def test_order_matters(self, crc):
+        """Byte order affects CRC."""
+        assert crc.crc32(b"ab") != crc.crc32(b"ba")
+
+    def test_returns_32bit_unsigned(self, crc):
+        """Result is always 32-bit unsigned."""
+        test_cases = [b"", b"test", bytes(range(256))]
+        for data in test_cases:
+            result = crc.crc32(data)
+            assert 0 <= result <= 0xFFFFFFFF
+            assert isinstance(result, int)
+
+
+class TestCrc32Sb8:
+    """Tests for the slicing-by-8 fallback."""
+
+    def test_known_vector(self, crc):
+        """Standard test vector."""
+        assert crc._crc32_sb8(b"123456789") == 0xCBF43926
+
+    def test_matches_crc32(self, crc):
+        """Fallback matches the zlib-backed crc32 on varied lengths."""
         test_cases = [
             b"",
             b"a",
-            b"abc",
-            b"Hello, World!",
+            b"12345678",  # exactly one 8-byte block
+            b"123456789",  # block + tail
             bytes(range(256)),
             b"\x00" * 100,
-            b"\xFF" * 100,
+            bytes(range(256)) * 10,
         ]
         for data in test_cases:
-            expected = zlib.crc32(data) & 0xFFFFFFFF
-            assert crc32(data) == expected, f"Mismatch for {data!r}"
+            assert crc._crc32_sb8(data) == crc.crc32(data), f"Mismatch for {data!r}"
 
-    def test_large_data(self):
-        """CRC of large data matches zlib."""
-        data = bytes(range(256)) * 1000  # 256KB
-        expected = zlib.crc32(data) & 0xFFFFFFFF
-        assert crc32(data) == expected
 
-    def test_incremental_differs(self):
-        """Different data produces different CRC."""
-        assert crc32(b"test1") != crc32(b"test2")
-        assert crc32(b"\x00") != crc32(b"\x01")
+class TestCrc32Py:
+    """Tests for the byte-at-a-time reference implementation."""
 
-    def test_order_matters(self):
-        """Byte order affects CRC."""
-        assert crc32(b"ab") != crc32(b"ba")
+    def test_known_vector(self, crc):
+        """Standard test vector."""
+        assert crc._crc32_py(b"123456789") == 0xCBF43926
 
-    def test_returns_32bit_unsigned(self):
-        """Result is always 32-bit unsigned."""
-        test_cases = [b"", b"test", bytes(range(256))]
+    def test_matches_crc32(self, crc):
+        """Reference loop matches the zlib-backed crc32."""
+        test_cases = [
+            b"",
+            b"a",
+            b"123456789",
+            bytes(range(256)),
+            b"\x00" * 100,
+        ]
         for data in test_cases:
-            result = crc32(data)
-            assert 0 <= result <= 0xFFFFFFFF
-            assert isinstance(result, int)
+            assert crc._crc32_py(data) == crc.crc32(data), f"Mismatch for {data!r}"
+
+
+class TestCrc32c:
+    """Tests for the CRC-32C (Castagnoli) variant."""
+
+    def test_empty_data(self, crc):
+        """CRC-32C of empty data."""
+        assert crc.crc32c(b"") == 0x00000000
+
+    def test_known_vector(self, crc):
+        """Standard CRC-32C test vector."""
+        assert crc.crc32c(b"123456789") == 0xE3069283
+
+    def test_differs_from_ieee(self, crc):
+        """Castagnoli and IEEE polynomials disagree on non-empty data."""
+        assert crc.crc32c(b"123456789") != crc.crc32(b"123456789")
 
 
 class TestCrc32Table:
     """Tests for CRC-32 lookup table."""
 
-    def test_table_initialized(self):
+    def test_table_initialized(self, crc):
         """Table is initialized with 256 entries."""
-        assert len(_CRC32_TABLE) == 256
+        assert len(crc._CRC32_TABLE) == 256
 
-    def test_table_values_32bit(self):
+    def test_table_values_32bit(self, crc):
         """All table values are 32-bit."""
-        for value in _CRC32_TABLE:
+        for value in crc._CRC32_TABLE:
             assert 0 <= value <= 0xFFFFFFFF
 
-    def test_table_first_entry(self):
+    def test_table_first_entry(self, crc):
         """First entry is 0."""
-        assert _CRC32_TABLE[0] == 0
+        assert crc._CRC32_TABLE[0] == 0
 
-    def test_table_deterministic(self):
+    def test_table_deterministic(self, crc):
         """Table values are deterministic."""
         # Verify known values at specific indices
         # These are derived from the polynomial 0xEDB88320
-        assert _CRC32_TABLE[0] == 0x00000000
-        assert _CRC32_TABLE[1] == 0x77073096
-        assert _CRC32_TABLE[255] == 0x2D02EF8D
+        assert crc._CRC32_TABLE[0] == 0x00000000
+        assert crc._CRC32_TABLE[1] == 0x77073096
+        assert crc._CRC32_TABLE[255] == 0x2D02EF8D
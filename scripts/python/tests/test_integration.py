@@ -15,92 +15,38 @@ Features tested:
 - Bank switching
 """
 
-import os
-import subprocess
 import time
-from pathlib import Path
 
 import pytest
 
+from crispy_protocol.crc32 import crc32
+from crispy_protocol.protocol import AckStatus, BootState, Command, Response
+from crispy_protocol.transport import TransportError
+
+from tests.conftest import enter_update_mode_via_swd
+
 # Skip all tests if no device specified
 pytestmark = pytest.mark.integration
 
+# Data block payload size. This is the bootloader's MAX_DATA_BLOCK_SIZE
+# (crispy-common/src/protocol.rs) — its receive buffer is heapless, so
+# larger blocks need a protocol change on both sides, not just here.
+CHUNK_SIZE = 1024
+
 
 class TestBuildArtifacts:
     """Feature: Build bootloader and firmware artifacts."""
 
-    def test_build_bootloader(self, project_root, skip_build):
-        """Scenario: Build the bootloader."""
-        if skip_build:
-            pytest.skip("Build skipped")
-
-        result = subprocess.run(
-            [
-                "cargo",
-                "build",
-                "--release",
-                "-p",
-                "crispy-bootloader",
-                "--target",
-                "thumbv6m-none-eabi",
-            ],
-            cwd=project_root,
-            capture_output=True,
-            text=True,
-        )
-        assert result.returncode == 0, f"Build failed: {result.stderr}"
-
-    def test_build_firmware(self, project_root, skip_build):
-        """Scenario: Build the sample firmware."""
-        if skip_build:
-            pytest.skip("Build skipped")
-
-        result = subprocess.run(
-            [
-                "cargo",
-                "build",
-                "--release",
-                "-p",
-                "crispy-fw-sample-rs",
-                "--target",
-                "thumbv6m-none-eabi",
-            ],
-            cwd=project_root,
-            capture_output=True,
-            text=True,
-        )
-        assert result.returncode == 0, f"Build failed: {result.stderr}"
-
-    def test_create_firmware_binary(self, project_root, skip_build):
-        """Scenario: Create firmware binary from ELF."""
-        if skip_build:
-            pytest.skip("Build skipped")
-
-        elf_path = (
-            project_root
-            / "target"
-            / "thumbv6m-none-eabi"
-            / "release"
-            / "crispy-fw-sample-rs"
-        )
-        bin_path = project_root / "target" / "firmware.bin"
+    def test_create_firmware_binary(self, firmware_bin):
+        """Scenario: Firmware binary is built from the sample ELF."""
+        # The firmware_bin fixture runs cargo + objcopy (once per
+        # session, and only when the artifacts are stale)
+        assert firmware_bin.exists(), "Firmware binary not created"
 
-        result = subprocess.run(
-            ["arm-none-eabi-objcopy", "-O", "binary", str(elf_path), str(bin_path)],
-            capture_output=True,
-            text=True,
-        )
-        assert result.returncode == 0, f"objcopy failed: {result.stderr}"
-        assert bin_path.exists(), "Firmware binary not created"
-
-    def test_firmware_size(self, project_root):
+    def test_firmware_size(self, firmware_bin):
         """Scenario: Firmware size is within bank limits."""
-        bin_path = project_root / "target" / "firmware.bin"
-        if not bin_path.exists():
-            pytest.skip("Firmware binary not found")
-
         max_size = 768 * 1024  # 768KB bank size
-        actual_size = bin_path.stat().st_size
+        actual_size = firmware_bin.stat().st_size
 
         assert actual_size < max_size, f"Firmware too large: {actual_size} > {max_size}"
         print(f"Firmware size: {actual_size} bytes ({actual_size / 1024:.1f} KB)")
@@ -111,8 +57,6 @@ class TestBootloaderStatus:
 
     def test_get_status(self, transport):
         """Scenario: Get bootloader status when in update mode."""
-        from crispy_protocol.protocol import Command, Response
-
         # Given the device is in update mode
         # When I send a GetStatus command
         transport.send(Command.get_status())
@@ -129,8 +73,6 @@ class TestBootloaderStatus:
 
     def test_status_shows_update_mode(self, transport):
         """Scenario: Status indicates update mode."""
-        from crispy_protocol.protocol import BootState, Command, Response
-
         transport.send(Command.get_status())
         response = transport.receive()
 
@@ -140,28 +82,55 @@ class TestBootloaderStatus:
         ), f"Expected UpdateMode or Receiving, got {response.state}"
 
 
-class TestFirmwareUpload:
-    """Feature: Upload firmware to device."""
+UPLOAD_VERSION_A = 42
 
-    @pytest.fixture
-    def firmware_path(self, project_root):
-        path = project_root / "target" / "firmware.bin"
-        if not path.exists():
-            pytest.skip("Firmware binary not found. Run build tests first.")
-        return path
 
-    @pytest.fixture
-    def firmware_data(self, firmware_path):
-        return firmware_path.read_bytes()
+@pytest.fixture(scope="session")
+def uploaded_bank_a(transport, firmware_data, firmware_crc):
+    """Upload the firmware to bank A exactly once per session.
 
-    def test_start_update_bank_a(self, transport, firmware_data):
-        """Scenario: Start firmware update to bank A."""
-        from crispy_protocol.crc32 import crc32
-        from crispy_protocol.protocol import AckStatus, Command, Response
+    Scenarios that only inspect the outcome (FinishUpdate result,
+    status/version reporting) depend on this instead of each re-running
+    the full StartUpdate -> DataBlock -> FinishUpdate cycle over USB.
+    Returns the version number that was uploaded.
+    """
+    # Session fixtures instantiate before the autouse reset fixture, so
+    # whatever test triggers this one may have left the bootloader
+    # mid-update (Receiving), where StartUpdate answers BadState.
+    # Establish Idle ourselves instead of trusting the previous test.
+    if not enter_update_mode_via_swd():
+        pytest.fail("Failed to enter update mode via SWD")
+    transport.reconnect()
+
+    size = len(firmware_data)
+    transport.send(Command.start_update(
+        bank=0, size=size, crc32=firmware_crc, version=UPLOAD_VERSION_A
+    ))
+    assert transport.receive().status == AckStatus.OK
+
+    mv = memoryview(firmware_data)
+    offset = 0
+    while offset < size:
+        chunk = mv[offset : offset + CHUNK_SIZE]
+        transport.send(Command.data_block(offset=offset, data=chunk))
+        assert transport.receive().status == AckStatus.OK
+        offset += len(chunk)
+
+    transport.send(Command.finish_update())
+    response = transport.receive()
+    assert response.status == AckStatus.OK, f"FinishUpdate failed: {response.status}"
+    return UPLOAD_VERSION_A
 
+
+@pytest.mark.mutates_bootloader
+class TestFirmwareUpload:
+    """Feature: Upload firmware to device."""
+
+    def test_start_update_bank_a(self, transport, firmware_data, firmware_crc):
+        """Scenario: Start firmware update to bank A."""
         # Given I have firmware data
         size = len(firmware_data)
-        checksum = crc32(firmware_data)
+        checksum = firmware_crc
 
         # When I send StartUpdate for bank A
         transport.send(Command.start_update(bank=0, size=size, crc32=checksum, version=1))
@@ -172,24 +141,22 @@ class TestFirmwareUpload:
         assert response.type == Response.TYPE_ACK, f"Expected Ack, got {response}"
         assert response.status == AckStatus.OK, f"Expected OK, got {response.status}"
 
-    def test_upload_data_blocks(self, transport, firmware_data):
+    def test_upload_data_blocks(self, transport, firmware_data, firmware_crc):
         """Scenario: Upload firmware data in blocks."""
-        from crispy_protocol.crc32 import crc32
-        from crispy_protocol.protocol import AckStatus, Command, Response
-
         size = len(firmware_data)
-        checksum = crc32(firmware_data)
-        chunk_size = 1024
+        checksum = firmware_crc
+        chunk_size = CHUNK_SIZE
 
         # Start update
         transport.send(Command.start_update(bank=0, size=size, crc32=checksum, version=2))
         response = transport.receive()
         assert response.status == AckStatus.OK, f"StartUpdate failed: {response.status}"
 
-        # Upload data blocks
+        # Upload data blocks (memoryview slices are views, not copies)
+        mv = memoryview(firmware_data)
         offset = 0
         while offset < size:
-            chunk = firmware_data[offset : offset + chunk_size]
+            chunk = mv[offset : offset + chunk_size]
             transport.send(Command.data_block(offset=offset, data=chunk))
 
             response = transport.receive()
@@ -203,93 +170,43 @@ class TestFirmwareUpload:
 
         print(f"Uploaded {offset} bytes in {offset // chunk_size + 1} blocks")
 
-    def test_finish_update(self, transport, firmware_data):
+    def test_finish_update(self, uploaded_bank_a):
         """Scenario: Finish firmware update and verify CRC."""
-        from crispy_protocol.crc32 import crc32
-        from crispy_protocol.protocol import AckStatus, Command, Response
-
-        size = len(firmware_data)
-        checksum = crc32(firmware_data)
-        chunk_size = 1024
-
-        # Start and upload
-        transport.send(Command.start_update(bank=0, size=size, crc32=checksum, version=3))
-        assert transport.receive().status == AckStatus.OK
-
-        offset = 0
-        while offset < size:
-            chunk = firmware_data[offset : offset + chunk_size]
-            transport.send(Command.data_block(offset=offset, data=chunk))
-            assert transport.receive().status == AckStatus.OK
-            offset += len(chunk)
-
-        # Finish update
-        transport.send(Command.finish_update())
-        response = transport.receive()
-
-        assert response is not None, "No response to FinishUpdate"
-        assert response.type == Response.TYPE_ACK, f"Expected Ack, got {response}"
-        assert response.status == AckStatus.OK, f"FinishUpdate failed: {response.status}"
-
+        # The shared upload fixture drove StartUpdate -> DataBlocks ->
+        # FinishUpdate once; an OK FinishUpdate means the bootloader's
+        # CRC verification passed.
+        assert uploaded_bank_a == UPLOAD_VERSION_A
         print("Firmware update completed successfully!")
 
-    def test_status_after_upload(self, transport, firmware_data):
+    def test_status_after_upload(self, transport, uploaded_bank_a):
         """Scenario: Status reflects uploaded firmware version."""
-        from crispy_protocol.crc32 import crc32
-        from crispy_protocol.protocol import AckStatus, Command, Response
-
-        size = len(firmware_data)
-        checksum = crc32(firmware_data)
-        version = 42
-
-        # Upload to bank A with specific version
-        transport.send(Command.start_update(bank=0, size=size, crc32=checksum, version=version))
-        assert transport.receive().status == AckStatus.OK
-
-        offset = 0
-        while offset < size:
-            chunk = firmware_data[offset : offset + 1024]
-            transport.send(Command.data_block(offset=offset, data=chunk))
-            assert transport.receive().status == AckStatus.OK
-            offset += len(chunk)
-
-        transport.send(Command.finish_update())
-        assert transport.receive().status == AckStatus.OK
-
-        # Check status
         transport.send(Command.get_status())
         response = transport.receive()
 
         assert response.active_bank == 0, f"Expected bank 0, got {response.active_bank}"
-        assert response.version_a == version, f"Expected version {version}, got {response.version_a}"
+        assert response.version_a == uploaded_bank_a, (
+            f"Expected version {uploaded_bank_a}, got {response.version_a}"
+        )
 
 
+@pytest.mark.mutates_bootloader
 class TestBankSwitching:
     """Feature: Switch between firmware banks."""
 
-    @pytest.fixture
-    def firmware_data(self, project_root):
-        path = project_root / "target" / "firmware.bin"
-        if not path.exists():
-            pytest.skip("Firmware binary not found")
-        return path.read_bytes()
-
-    def test_upload_to_bank_b(self, transport, firmware_data):
+    def test_upload_to_bank_b(self, transport, firmware_data, firmware_crc):
         """Scenario: Upload firmware to bank B."""
-        from crispy_protocol.crc32 import crc32
-        from crispy_protocol.protocol import AckStatus, Command
-
         size = len(firmware_data)
-        checksum = crc32(firmware_data)
+        checksum = firmware_crc
         version = 100
 
         # Upload to bank B
         transport.send(Command.start_update(bank=1, size=size, crc32=checksum, version=version))
         assert transport.receive().status == AckStatus.OK
 
+        mv = memoryview(firmware_data)
         offset = 0
         while offset < size:
-            chunk = firmware_data[offset : offset + 1024]
+            chunk = mv[offset : offset + CHUNK_SIZE]
             transport.send(Command.data_block(offset=offset, data=chunk))
             assert transport.receive().status == AckStatus.OK
             offset += len(chunk)
@@ -305,13 +222,18 @@ class TestBankSwitching:
         assert response.version_b == version, f"Expected version {version}, got {response.version_b}"
 
 
+@pytest.mark.mutates_bootloader
 class TestErrorHandling:
     """Feature: Handle error conditions gracefully."""
 
+    @pytest.fixture(autouse=True)
+    def _reset_state(self, transport):
+        """Nudge the bootloader to a known state before each scenario."""
+        transport.send(Command.get_status())
+        transport.receive()  # drain
+
     def test_invalid_bank(self, transport):
         """Scenario: Reject invalid bank number."""
-        from crispy_protocol.protocol import AckStatus, Command
-
         transport.send(Command.start_update(bank=2, size=1024, crc32=0, version=1))
         response = transport.receive()
 
@@ -319,8 +241,6 @@ class TestErrorHandling:
 
     def test_zero_size(self, transport):
         """Scenario: Reject zero-size firmware."""
-        from crispy_protocol.protocol import AckStatus, Command
-
         transport.send(Command.start_update(bank=0, size=0, crc32=0, version=1))
         response = transport.receive()
 
@@ -328,12 +248,6 @@ class TestErrorHandling:
 
     def test_data_block_without_start(self, transport):
         """Scenario: Reject data block without StartUpdate."""
-        from crispy_protocol.protocol import AckStatus, Command
-
-        # Ensure we're in Idle state by getting status first
-        transport.send(Command.get_status())
-        transport.receive()
-
         # Try to send data without starting
         transport.send(Command.data_block(offset=0, data=b"\x00" * 256))
         response = transport.receive()
@@ -342,9 +256,6 @@ class TestErrorHandling:
 
     def test_wrong_offset(self, transport):
         """Scenario: Reject data block with wrong offset."""
-        from crispy_protocol.crc32 import crc32
-        from crispy_protocol.protocol import AckStatus, Command
-
         data = b"\x00" * 2048
         transport.send(Command.start_update(bank=0, size=len(data), crc32=crc32(data), version=1))
         assert transport.receive().status == AckStatus.OK
@@ -361,8 +272,6 @@ class TestErrorHandling:
 
     def test_crc_mismatch(self, transport):
         """Scenario: Detect CRC mismatch on finish."""
-        from crispy_protocol.protocol import AckStatus, Command
-
         data = b"\x00" * 1024
         wrong_crc = 0xDEADBEEF
 
@@ -378,13 +287,12 @@ class TestErrorHandling:
         assert response.status == AckStatus.CRC_ERROR
 
 
+@pytest.mark.mutates_bootloader
 class TestReboot:
     """Feature: Reboot device."""
 
     def test_reboot_command(self, transport):
         """Scenario: Reboot the device."""
-        from crispy_protocol.protocol import AckStatus, Command
-
         transport.send(Command.reboot())
         response = transport.receive()
 
@@ -396,28 +304,23 @@ class TestReboot:
 
 
 # Convenience function to run a full upload cycle
-def upload_firmware(transport, firmware_data: bytes, bank: int, version: int) -> bool:
-    """Helper to upload firmware to a bank."""
-    from crispy_protocol.crc32 import crc32
-    from crispy_protocol.protocol import AckStatus, Command
-
-    size = len(firmware_data)
-    checksum = crc32(firmware_data)
-
-    transport.send(Command.start_update(bank=bank, size=size, crc32=checksum, version=version))
-    if transport.receive().status != AckStatus.OK:
+def upload_firmware(
+    transport, firmware_data: bytes, bank: int, version: int, pipeline_depth: int = 4
+) -> bool:
+    """Helper to upload firmware to a bank.
+
+    Delegates to the transport's pipelined upload, which keeps
+    pipeline_depth data blocks in flight so serial TX overlaps the
+    bootloader's ACK turnaround instead of paying one USB round-trip
+    per 1 KB chunk (pass --pipeline-depth to tune it for a whole run).
+    """
+    try:
+        transport.upload_firmware(
+            firmware_data, bank, version, pipeline_depth=pipeline_depth
+        )
+    except TransportError:
         return False
-
-    offset = 0
-    while offset < size:
-        chunk = firmware_data[offset : offset + 1024]
-        transport.send(Command.data_block(offset=offset, data=chunk))
-        if transport.receive().status != AckStatus.OK:
-            return False
-        offset += len(chunk)
-
-    transport.send(Command.finish_update())
-    return transport.receive().status == AckStatus.OK
+    return True
 
 
 if __name__ == "__main__":
@@ -20,7 +20,35 @@ from crispy_protocol.protocol import (
     decode_response,
     _frame,
 )
-from crispy_protocol.cobs import cobs_decode
+from crispy_protocol.cobs import cobs_encode, cobs_decode
+from crispy_protocol.varint import encode_varint
+
+# Framed responses consumed by TestDecodeResponse, encoded once at
+# import instead of once per test (and per xdist worker re-run).
+_FRAMED_ACK_OK = cobs_encode(bytes([0, AckStatus.OK])) + b"\x00"
+_FRAMED_ACK_CRC_ERROR = cobs_encode(bytes([0, AckStatus.CRC_ERROR])) + b"\x00"
+_FRAMED_STATUS_BANK_A = cobs_encode(
+    bytes([1, 0])  # Type 1 = Status, bank 0
+    + encode_varint(5)  # version_a = 5
+    + encode_varint(3)  # version_b = 3
+    + bytes([BootState.UPDATE_MODE])
+) + b"\x00"
+_FRAMED_STATUS_BANK_B = cobs_encode(
+    bytes([1, 1])  # Type 1 = Status, bank 1
+    + encode_varint(10)
+    + encode_varint(20)
+    + bytes([BootState.IDLE])
+) + b"\x00"
+_FRAMED_STATUS_LARGE_VERSIONS = cobs_encode(
+    bytes([1, 0])
+    + encode_varint(0xFFFFFFFF)  # Max u32
+    + encode_varint(0x12345678)
+    + bytes([BootState.RECEIVING])
+) + b"\x00"
+_FRAMED_EMPTY = cobs_encode(b"") + b"\x00"
+_FRAMED_TRUNCATED_ACK = cobs_encode(bytes([0])) + b"\x00"  # Type only, no status
+_FRAMED_TRUNCATED_STATUS = cobs_encode(bytes([1])) + b"\x00"  # Type only
+_FRAMED_UNKNOWN_TYPE = cobs_encode(bytes([99, 0, 0])) + b"\x00"  # Unknown type 99
 
 
 class TestCommandEnum:
@@ -82,12 +110,10 @@ class TestAckResponse:
         resp = AckResponse(status=AckStatus.OK)
         assert resp.is_ok is True
 
-    def test_is_ok_false(self):
+    @pytest.mark.parametrize("status", [s for s in AckStatus if s != AckStatus.OK])
+    def test_is_ok_false(self, status):
         """is_ok returns False for non-OK status."""
-        for status in AckStatus:
-            if status != AckStatus.OK:
-                resp = AckResponse(status=status)
-                assert resp.is_ok is False
+        assert AckResponse(status=status).is_ok is False
 
 
 class TestStatusResponse:
@@ -124,17 +150,23 @@ class TestFrame:
         assert decoded == b"\x01\x02\x03"
 
 
-class TestEncodeGetStatus:
-    """Tests for encode_get_status."""
+class TestEncodeNullaryCommands:
+    """Tests for the no-argument command encoders."""
 
-    def test_encodes_correctly(self):
-        """GetStatus command encodes correctly."""
-        encoded = encode_get_status()
+    @pytest.mark.parametrize("encode,command", [
+        (encode_get_status, CommandType.GET_STATUS),
+        (encode_finish_update, CommandType.FINISH_UPDATE),
+        (encode_reboot, CommandType.REBOOT),
+        (encode_wipe_all, CommandType.WIPE_ALL),
+    ], ids=lambda v: v.name if isinstance(v, CommandType) else "")
+    def test_encodes_correctly(self, encode, command):
+        """Each nullary command encodes to its single type byte."""
+        encoded = encode()
         assert encoded[-1] == 0  # COBS delimiter
 
         # Decode and verify
         decoded = cobs_decode(encoded[:-1])
-        assert decoded == bytes([CommandType.GET_STATUS])
+        assert decoded == bytes([command])
 
 
 class TestEncodeStartUpdate:
@@ -146,20 +178,19 @@ class TestEncodeStartUpdate:
         assert encoded[-1] == 0
 
         decoded = cobs_decode(encoded[:-1])
-        assert decoded[0] == CommandType.START_UPDATE
-        assert decoded[1] == 0  # bank
+        assert decoded.startswith(bytes([CommandType.START_UPDATE, 0]))  # type, bank
 
     def test_encodes_bank_b(self):
         """StartUpdate for bank B."""
         encoded = encode_start_update(bank=1, size=1024, crc32=0, version=5)
         decoded = cobs_decode(encoded[:-1])
-        assert decoded[1] == 1  # bank B
+        assert decoded.startswith(bytes([CommandType.START_UPDATE, 1]))  # bank B
 
     def test_encodes_large_size(self):
         """StartUpdate with large size value."""
         encoded = encode_start_update(bank=0, size=786432, crc32=0xDEADBEEF, version=100)
         decoded = cobs_decode(encoded[:-1])
-        assert decoded[0] == CommandType.START_UPDATE
+        assert decoded.startswith(bytes([CommandType.START_UPDATE]))
         # Varints should decode correctly (tested via roundtrip)
 
 
@@ -173,21 +204,21 @@ class TestEncodeDataBlock:
         assert encoded[-1] == 0
 
         decoded = cobs_decode(encoded[:-1])
-        assert decoded[0] == CommandType.DATA_BLOCK
+        assert decoded.startswith(bytes([CommandType.DATA_BLOCK]))
 
     def test_encodes_with_offset(self):
         """DataBlock with non-zero offset."""
         data = b"\xAA" * 100
         encoded = encode_data_block(offset=1024, data=data)
         decoded = cobs_decode(encoded[:-1])
-        assert decoded[0] == CommandType.DATA_BLOCK
+        assert decoded.startswith(bytes([CommandType.DATA_BLOCK]))
 
     def test_encodes_max_chunk(self):
         """DataBlock with max chunk size (1024 bytes)."""
         data = b"\xFF" * 1024
         encoded = encode_data_block(offset=0, data=data)
         decoded = cobs_decode(encoded[:-1])
-        assert decoded[0] == CommandType.DATA_BLOCK
+        assert decoded.startswith(bytes([CommandType.DATA_BLOCK]))
         # Data should be at the end
         assert data in decoded
 
@@ -199,60 +230,17 @@ class TestEncodeDataBlock:
         assert encoded.count(0) == 1  # Only the delimiter
 
 
-class TestEncodeFinishUpdate:
-    """Tests for encode_finish_update."""
-
-    def test_encodes_correctly(self):
-        """FinishUpdate command encodes correctly."""
-        encoded = encode_finish_update()
-        assert encoded[-1] == 0
-
-        decoded = cobs_decode(encoded[:-1])
-        assert decoded == bytes([CommandType.FINISH_UPDATE])
-
-
-class TestEncodeReboot:
-    """Tests for encode_reboot."""
-
-    def test_encodes_correctly(self):
-        """Reboot command encodes correctly."""
-        encoded = encode_reboot()
-        assert encoded[-1] == 0
-
-        decoded = cobs_decode(encoded[:-1])
-        assert decoded == bytes([CommandType.REBOOT])
-
-
 class TestEncodeSetActiveBank:
     """Tests for encode_set_active_bank."""
 
-    def test_encodes_bank_a(self):
-        """SetActiveBank for bank A encodes correctly."""
-        encoded = encode_set_active_bank(bank=0)
-        assert encoded[-1] == 0
-
-        decoded = cobs_decode(encoded[:-1])
-        assert decoded == bytes([CommandType.SET_ACTIVE_BANK, 0])
-
-    def test_encodes_bank_b(self):
-        """SetActiveBank for bank B encodes correctly."""
-        encoded = encode_set_active_bank(bank=1)
-        assert encoded[-1] == 0
-
-        decoded = cobs_decode(encoded[:-1])
-        assert decoded == bytes([CommandType.SET_ACTIVE_BANK, 1])
-
-
-class TestEncodeWipeAll:
-    """Tests for encode_wipe_all."""
-
-    def test_encodes_correctly(self):
-        """WipeAll command encodes correctly."""
-        encoded = encode_wipe_all()
+    @pytest.mark.parametrize("bank", [0, 1], ids=["bank_a", "bank_b"])
+    def test_encodes_bank(self, bank):
+        """SetActiveBank encodes the bank byte after the type."""
+        encoded = encode_set_active_bank(bank=bank)
         assert encoded[-1] == 0
 
         decoded = cobs_decode(encoded[:-1])
-        assert decoded == bytes([CommandType.WIPE_ALL])
+        assert decoded == bytes([CommandType.SET_ACTIVE_BANK, bank])
 
 
 class TestDecodeResponse:
@@ -260,41 +248,21 @@ class TestDecodeResponse:
 
     def test_decode_ack_ok(self):
         """Decode Ack response with OK status."""
-        from crispy_protocol.cobs import cobs_encode
-        raw = bytes([0, AckStatus.OK])  # Type 0 = Ack
-        framed = cobs_encode(raw) + b"\x00"
-
-        resp = decode_response(framed)
+        resp = decode_response(_FRAMED_ACK_OK)
         assert isinstance(resp, AckResponse)
         assert resp.status == AckStatus.OK
         assert resp.is_ok is True
 
     def test_decode_ack_error(self):
         """Decode Ack response with error status."""
-        from crispy_protocol.cobs import cobs_encode
-        raw = bytes([0, AckStatus.CRC_ERROR])
-        framed = cobs_encode(raw) + b"\x00"
-
-        resp = decode_response(framed)
+        resp = decode_response(_FRAMED_ACK_CRC_ERROR)
         assert isinstance(resp, AckResponse)
         assert resp.status == AckStatus.CRC_ERROR
         assert resp.is_ok is False
 
     def test_decode_status_response(self):
         """Decode Status response."""
-        from crispy_protocol.cobs import cobs_encode
-        from crispy_protocol.varint import encode_varint
-
-        # Build Status response: type=1, active_bank, version_a, version_b, state
-        raw = (
-            bytes([1, 0])  # Type 1 = Status, bank 0
-            + encode_varint(5)  # version_a = 5
-            + encode_varint(3)  # version_b = 3
-            + bytes([BootState.UPDATE_MODE])
-        )
-        framed = cobs_encode(raw) + b"\x00"
-
-        resp = decode_response(framed)
+        resp = decode_response(_FRAMED_STATUS_BANK_A)
         assert isinstance(resp, StatusResponse)
         assert resp.active_bank == 0
         assert resp.version_a == 5
@@ -303,18 +271,7 @@ class TestDecodeResponse:
 
     def test_decode_status_bank_b(self):
         """Decode Status response for bank B."""
-        from crispy_protocol.cobs import cobs_encode
-        from crispy_protocol.varint import encode_varint
-
-        raw = (
-            bytes([1, 1])  # Type 1 = Status, bank 1
-            + encode_varint(10)
-            + encode_varint(20)
-            + bytes([BootState.IDLE])
-        )
-        framed = cobs_encode(raw) + b"\x00"
-
-        resp = decode_response(framed)
+        resp = decode_response(_FRAMED_STATUS_BANK_B)
         assert resp.active_bank == 1
         assert resp.active_bank_name == "B"
         assert resp.version_a == 10
@@ -322,63 +279,33 @@ class TestDecodeResponse:
 
     def test_decode_without_delimiter(self):
         """Decode response without trailing delimiter."""
-        from crispy_protocol.cobs import cobs_encode
-        raw = bytes([0, AckStatus.OK])
-        framed = cobs_encode(raw)  # No trailing 0x00
-
-        resp = decode_response(framed)
+        resp = decode_response(_FRAMED_ACK_OK[:-1])  # No trailing 0x00
         assert isinstance(resp, AckResponse)
         assert resp.is_ok is True
 
     def test_decode_empty_raises(self):
         """Empty response raises ValueError."""
-        from crispy_protocol.cobs import cobs_encode
-        framed = cobs_encode(b"") + b"\x00"
-
         with pytest.raises(ValueError, match="Empty response"):
-            decode_response(framed)
+            decode_response(_FRAMED_EMPTY)
 
     def test_decode_truncated_ack_raises(self):
         """Truncated Ack response raises ValueError."""
-        from crispy_protocol.cobs import cobs_encode
-        raw = bytes([0])  # Type only, no status
-        framed = cobs_encode(raw) + b"\x00"
-
         with pytest.raises(ValueError, match="Truncated Ack"):
-            decode_response(framed)
+            decode_response(_FRAMED_TRUNCATED_ACK)
 
     def test_decode_truncated_status_raises(self):
         """Truncated Status response raises ValueError."""
-        from crispy_protocol.cobs import cobs_encode
-        raw = bytes([1])  # Type only
-        framed = cobs_encode(raw) + b"\x00"
-
         with pytest.raises(ValueError, match="Truncated Status"):
-            decode_response(framed)
+            decode_response(_FRAMED_TRUNCATED_STATUS)
 
     def test_decode_unknown_type_raises(self):
         """Unknown response type raises ValueError."""
-        from crispy_protocol.cobs import cobs_encode
-        raw = bytes([99, 0, 0])  # Unknown type 99
-        framed = cobs_encode(raw) + b"\x00"
-
         with pytest.raises(ValueError, match="Unknown response type"):
-            decode_response(framed)
+            decode_response(_FRAMED_UNKNOWN_TYPE)
 
     def test_decode_large_versions(self):
         """Decode Status with large version numbers."""
-        from crispy_protocol.cobs import cobs_encode
-        from crispy_protocol.varint import encode_varint
-
-        raw = (
-            bytes([1, 0])
-            + encode_varint(0xFFFFFFFF)  # Max u32
-            + encode_varint(0x12345678)
-            + bytes([BootState.RECEIVING])
-        )
-        framed = cobs_encode(raw) + b"\x00"
-
-        resp = decode_response(framed)
+        resp = decode_response(_FRAMED_STATUS_LARGE_VERSIONS)
         assert resp.version_a == 0xFFFFFFFF
         assert resp.version_b == 0x12345678
         assert resp.state == BootState.RECEIVING
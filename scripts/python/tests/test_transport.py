@@ -3,9 +3,10 @@
 
 """Tests for Transport class."""
 
+import struct
+
 import pytest
-from unittest.mock import Mock, patch, MagicMock
-from io import BytesIO
+from unittest.mock import Mock, patch
 
 from crispy_protocol.transport import (
     Transport,
@@ -27,7 +28,7 @@ from crispy_protocol.crc32 import crc32
 
 def make_ack_response(status: AckStatus) -> bytes:
     """Create a framed Ack response."""
-    raw = bytes([0, status])  # Type 0 = Ack
+    raw = bytes((0, status))  # Type 0 = Ack
     return cobs_encode(raw) + b"\x00"
 
 
@@ -38,46 +39,77 @@ def make_status_response(
     state: BootState
 ) -> bytes:
     """Create a framed Status response."""
-    raw = (
-        bytes([1, active_bank])
-        + encode_varint(version_a)
-        + encode_varint(version_b)
-        + bytes([state])
-    )
+    # join assembles the payload in one allocation instead of a copy per +
+    raw = b"".join((
+        struct.pack("<BB", 1, active_bank),  # Type 1 = Status
+        encode_varint(version_a),
+        encode_varint(version_b),
+        bytes((state,)),
+    ))
     return cobs_encode(raw) + b"\x00"
 
 
+# Framed responses reused across the tests below, built once at import
+ACK_OK = make_ack_response(AckStatus.OK)
+ACK_CRC_ERROR = make_ack_response(AckStatus.CRC_ERROR)
+ACK_FLASH_ERROR = make_ack_response(AckStatus.FLASH_ERROR)
+ACK_BAD_STATE = make_ack_response(AckStatus.BAD_STATE)
+ACK_BANK_INVALID = make_ack_response(AckStatus.BANK_INVALID)
+STATUS_IDLE = make_status_response(0, 1, 1, BootState.IDLE)
+
+# Firmware payload for the file-upload test, with its CRC computed once
+FW_DATA = b"\xDE\xAD\xBE\xEF" * 25
+FW_CRC = crc32(FW_DATA)
+
+
 class MockSerial:
     """Mock serial port for testing."""
 
+    # Fixed attribute slots: no per-instance __dict__, and a typo'd
+    # attribute fails loudly instead of creating a new one. "timeout"
+    # is included because Transport's probe path saves and restores it.
+    __slots__ = ("_buf", "_pos", "written", "is_open", "port", "timeout")
+
     def __init__(self, responses: list[bytes] = None):
-        self.responses = responses or []
-        self.response_idx = 0
-        self.written = BytesIO()
-        self.is_open = True
+        self.written = bytearray()
         self.port = "/dev/ttyTEST"
+        self.reset(responses)
+
+    def reset(self, responses: list[bytes] = None):
+        """Rewind to a fresh state with a new scripted response list."""
+        # One flat buffer with a cursor instead of per-response index
+        # bookkeeping; response boundaries are the 0x00 delimiters.
+        self._buf = b"".join(responses or [])
+        self._pos = 0
+        self.written.clear()
+        self.is_open = True
 
     def read(self, size: int) -> bytes:
-        """Read bytes, returning from response queue."""
-        if self.response_idx >= len(self.responses):
+        """Read up to size bytes from the buffered responses."""
+        if self._pos >= len(self._buf):
             return b""  # Timeout
 
-        resp = self.responses[self.response_idx]
-        if not hasattr(self, '_resp_offset'):
-            self._resp_offset = 0
-
-        # Return one byte at a time
-        if self._resp_offset < len(resp):
-            byte = bytes([resp[self._resp_offset]])
-            self._resp_offset += 1
-            if self._resp_offset >= len(resp):
-                self.response_idx += 1
-                self._resp_offset = 0
-            return byte
-        return b""
+        chunk = self._buf[self._pos : self._pos + size]
+        self._pos += len(chunk)
+        return chunk
+
+    def read_until(self, expected: bytes = b"\n", size: int = None) -> bytes:
+        """Read through the delimiter (one framed response per call)."""
+        # Locate the delimiter with one find() and hand back a single
+        # slice, instead of growing a bytearray one read(1) at a time.
+        end = self._buf.find(expected, self._pos)
+        if end < 0:
+            end = len(self._buf)  # Timeout: return what we have
+        else:
+            end += len(expected)
+        if size is not None:
+            end = min(end, self._pos + size)
+        chunk = self._buf[self._pos:end]
+        self._pos = end
+        return chunk
 
     def write(self, data: bytes) -> int:
-        self.written.write(data)
+        self.written += data
         return len(data)
 
     def flush(self):
@@ -87,14 +119,60 @@ class MockSerial:
         self.is_open = False
 
 
+@pytest.fixture(scope="module")
+def _serial_patchers():
+    """Patch serial.Serial and time.sleep once for the whole module."""
+    serial_patcher = patch("crispy_protocol.transport.serial.Serial")
+    sleep_patcher = patch("crispy_protocol.transport.time.sleep")
+    yield serial_patcher.start(), sleep_patcher.start()
+    serial_patcher.stop()
+    sleep_patcher.stop()
+
+
+@pytest.fixture
+def patched_serial(_serial_patchers):
+    """Per-test view of the patched (Serial, sleep) pair.
+
+    The patchers start once per module; this just clears call history
+    and return values so each test sees fresh mocks without paying two
+    patcher setups per test.
+    """
+    mock_serial_class, mock_sleep = _serial_patchers
+    mock_serial_class.reset_mock(return_value=True, side_effect=True)
+    mock_sleep.reset_mock()
+    return mock_serial_class, mock_sleep
+
+
+@pytest.fixture(scope="module")
+def _shared_mock_serial():
+    """Single MockSerial instance reused across the module."""
+    return MockSerial()
+
+
+@pytest.fixture
+def mock_serial(patched_serial, _shared_mock_serial):
+    """Rewound shared MockSerial, wired in as the Serial() return value.
+
+    Tests load their scripted responses with mock_serial.reset([...]).
+    """
+    mock_serial_class, _ = patched_serial
+    _shared_mock_serial.reset()
+    mock_serial_class.return_value = _shared_mock_serial
+    return _shared_mock_serial
+
+
+# Attribute spec for bare serial-port mocks; a spec'd Mock rejects
+# typos and skips the dynamic child-mock creation of an unspecced one.
+SERIAL_SPEC = ["close", "is_open", "port", "read", "write", "flush"]
+
+
 class TestTransportInit:
     """Tests for Transport initialization."""
 
-    @patch('crispy_protocol.transport.serial.Serial')
-    @patch('crispy_protocol.transport.time.sleep')
-    def test_init_opens_serial(self, mock_sleep, mock_serial_class):
+    def test_init_opens_serial(self, patched_serial):
         """Transport opens serial port on init."""
-        mock_serial = Mock()
+        mock_serial_class, mock_sleep = patched_serial
+        mock_serial = Mock(spec=SERIAL_SPEC)
         mock_serial_class.return_value = mock_serial
 
         t = Transport("/dev/ttyACM0")
@@ -104,11 +182,10 @@ class TestTransportInit:
         )
         mock_sleep.assert_called_once_with(0.1)
 
-    @patch('crispy_protocol.transport.serial.Serial')
-    @patch('crispy_protocol.transport.time.sleep')
-    def test_init_custom_params(self, mock_sleep, mock_serial_class):
+    def test_init_custom_params(self, patched_serial):
         """Transport accepts custom baudrate and timeout."""
-        mock_serial = Mock()
+        mock_serial_class, mock_sleep = patched_serial
+        mock_serial = Mock(spec=SERIAL_SPEC)
         mock_serial_class.return_value = mock_serial
 
         t = Transport("/dev/ttyUSB0", baudrate=9600, timeout=10.0)
@@ -117,15 +194,34 @@ class TestTransportInit:
             "/dev/ttyUSB0", 9600, timeout=10.0
         )
 
+    def test_init_zero_settle_delay_skips_sleep(self, patched_serial):
+        """settle_delay=0 skips the settle wait."""
+        mock_serial_class, mock_sleep = patched_serial
+        mock_serial_class.return_value = Mock(spec=SERIAL_SPEC)
+
+        t = Transport("/dev/ttyACM0", settle_delay=0)
+
+        mock_sleep.assert_not_called()
+
+    def test_init_probe_polls_status(self, patched_serial, mock_serial):
+        """probe=True issues a GetStatus instead of sleeping."""
+        mock_serial_class, mock_sleep = patched_serial
+        mock_serial.reset([STATUS_IDLE])
+        mock_serial.timeout = 5.0
+
+        t = Transport("/dev/ttyACM0", probe=True)
+
+        mock_sleep.assert_not_called()
+        assert mock_serial.timeout == 5.0  # Restored after probing
+
 
 class TestTransportContextManager:
     """Tests for context manager functionality."""
 
-    @patch('crispy_protocol.transport.serial.Serial')
-    @patch('crispy_protocol.transport.time.sleep')
-    def test_context_manager_closes(self, mock_sleep, mock_serial_class):
+    def test_context_manager_closes(self, patched_serial):
         """Context manager closes serial on exit."""
-        mock_serial = Mock()
+        mock_serial_class, mock_sleep = patched_serial
+        mock_serial = Mock(spec=SERIAL_SPEC)
         mock_serial.is_open = True
         mock_serial_class.return_value = mock_serial
 
@@ -134,11 +230,10 @@ class TestTransportContextManager:
 
         mock_serial.close.assert_called_once()
 
-    @patch('crispy_protocol.transport.serial.Serial')
-    @patch('crispy_protocol.transport.time.sleep')
-    def test_context_manager_closes_on_exception(self, mock_sleep, mock_serial_class):
+    def test_context_manager_closes_on_exception(self, patched_serial):
         """Context manager closes serial even on exception."""
-        mock_serial = Mock()
+        mock_serial_class, mock_sleep = patched_serial
+        mock_serial = Mock(spec=SERIAL_SPEC)
         mock_serial.is_open = True
         mock_serial_class.return_value = mock_serial
 
@@ -152,11 +247,10 @@ class TestTransportContextManager:
 class TestTransportClose:
     """Tests for close method."""
 
-    @patch('crispy_protocol.transport.serial.Serial')
-    @patch('crispy_protocol.transport.time.sleep')
-    def test_close_closes_serial(self, mock_sleep, mock_serial_class):
+    def test_close_closes_serial(self, patched_serial):
         """close() closes the serial port."""
-        mock_serial = Mock()
+        mock_serial_class, mock_sleep = patched_serial
+        mock_serial = Mock(spec=SERIAL_SPEC)
         mock_serial.is_open = True
         mock_serial_class.return_value = mock_serial
 
@@ -165,11 +259,10 @@ class TestTransportClose:
 
         mock_serial.close.assert_called_once()
 
-    @patch('crispy_protocol.transport.serial.Serial')
-    @patch('crispy_protocol.transport.time.sleep')
-    def test_close_handles_already_closed(self, mock_sleep, mock_serial_class):
+    def test_close_handles_already_closed(self, patched_serial):
         """close() handles already closed port."""
-        mock_serial = Mock()
+        mock_serial_class, mock_sleep = patched_serial
+        mock_serial = Mock(spec=SERIAL_SPEC)
         mock_serial.is_open = False
         mock_serial_class.return_value = mock_serial
 
@@ -182,11 +275,10 @@ class TestTransportClose:
 class TestTransportPort:
     """Tests for port property."""
 
-    @patch('crispy_protocol.transport.serial.Serial')
-    @patch('crispy_protocol.transport.time.sleep')
-    def test_port_property(self, mock_sleep, mock_serial_class):
+    def test_port_property(self, patched_serial):
         """port property returns serial port name."""
-        mock_serial = Mock()
+        mock_serial_class, mock_sleep = patched_serial
+        mock_serial = Mock(spec=SERIAL_SPEC)
         mock_serial.port = "/dev/ttyACM0"
         mock_serial_class.return_value = mock_serial
 
@@ -197,13 +289,10 @@ class TestTransportPort:
 class TestTransportGetStatus:
     """Tests for get_status method."""
 
-    @patch('crispy_protocol.transport.serial.Serial')
-    @patch('crispy_protocol.transport.time.sleep')
-    def test_get_status_success(self, mock_sleep, mock_serial_class):
+    def test_get_status_success(self, mock_serial):
         """get_status returns StatusResponse."""
         response = make_status_response(0, 5, 3, BootState.IDLE)
-        mock_serial = MockSerial([response])
-        mock_serial_class.return_value = mock_serial
+        mock_serial.reset([response])
 
         t = Transport("/dev/ttyACM0")
         status = t.get_status()
@@ -214,13 +303,10 @@ class TestTransportGetStatus:
         assert status.version_b == 3
         assert status.state == BootState.IDLE
 
-    @patch('crispy_protocol.transport.serial.Serial')
-    @patch('crispy_protocol.transport.time.sleep')
-    def test_get_status_wrong_response_type(self, mock_sleep, mock_serial_class):
+    def test_get_status_wrong_response_type(self, mock_serial):
         """get_status raises ProtocolError for wrong response type."""
-        response = make_ack_response(AckStatus.OK)
-        mock_serial = MockSerial([response])
-        mock_serial_class.return_value = mock_serial
+        response = ACK_OK
+        mock_serial.reset([response])
 
         t = Transport("/dev/ttyACM0")
 
@@ -231,13 +317,10 @@ class TestTransportGetStatus:
 class TestTransportStartUpdate:
     """Tests for start_update method."""
 
-    @patch('crispy_protocol.transport.serial.Serial')
-    @patch('crispy_protocol.transport.time.sleep')
-    def test_start_update_success(self, mock_sleep, mock_serial_class):
+    def test_start_update_success(self, mock_serial):
         """start_update returns AckResponse."""
-        response = make_ack_response(AckStatus.OK)
-        mock_serial = MockSerial([response])
-        mock_serial_class.return_value = mock_serial
+        response = ACK_OK
+        mock_serial.reset([response])
 
         t = Transport("/dev/ttyACM0")
         resp = t.start_update(bank=0, size=1024, crc=0x12345678, version=1)
@@ -245,13 +328,10 @@ class TestTransportStartUpdate:
         assert isinstance(resp, AckResponse)
         assert resp.is_ok is True
 
-    @patch('crispy_protocol.transport.serial.Serial')
-    @patch('crispy_protocol.transport.time.sleep')
-    def test_start_update_wrong_response_type(self, mock_sleep, mock_serial_class):
+    def test_start_update_wrong_response_type(self, mock_serial):
         """start_update raises ProtocolError for wrong response type."""
-        response = make_status_response(0, 1, 1, BootState.IDLE)
-        mock_serial = MockSerial([response])
-        mock_serial_class.return_value = mock_serial
+        response = STATUS_IDLE
+        mock_serial.reset([response])
 
         t = Transport("/dev/ttyACM0")
 
@@ -262,26 +342,20 @@ class TestTransportStartUpdate:
 class TestTransportSendDataBlock:
     """Tests for send_data_block method."""
 
-    @patch('crispy_protocol.transport.serial.Serial')
-    @patch('crispy_protocol.transport.time.sleep')
-    def test_send_data_block_success(self, mock_sleep, mock_serial_class):
+    def test_send_data_block_success(self, mock_serial):
         """send_data_block returns AckResponse."""
-        response = make_ack_response(AckStatus.OK)
-        mock_serial = MockSerial([response])
-        mock_serial_class.return_value = mock_serial
+        response = ACK_OK
+        mock_serial.reset([response])
 
         t = Transport("/dev/ttyACM0")
         resp = t.send_data_block(offset=0, data=b"\x11\x22\x33")
 
         assert resp.is_ok is True
 
-    @patch('crispy_protocol.transport.serial.Serial')
-    @patch('crispy_protocol.transport.time.sleep')
-    def test_send_data_block_wrong_response_type(self, mock_sleep, mock_serial_class):
+    def test_send_data_block_wrong_response_type(self, mock_serial):
         """send_data_block raises ProtocolError for wrong response type."""
-        response = make_status_response(0, 1, 1, BootState.IDLE)
-        mock_serial = MockSerial([response])
-        mock_serial_class.return_value = mock_serial
+        response = STATUS_IDLE
+        mock_serial.reset([response])
 
         t = Transport("/dev/ttyACM0")
 
@@ -292,26 +366,20 @@ class TestTransportSendDataBlock:
 class TestTransportFinishUpdate:
     """Tests for finish_update method."""
 
-    @patch('crispy_protocol.transport.serial.Serial')
-    @patch('crispy_protocol.transport.time.sleep')
-    def test_finish_update_success(self, mock_sleep, mock_serial_class):
+    def test_finish_update_success(self, mock_serial):
         """finish_update returns AckResponse."""
-        response = make_ack_response(AckStatus.OK)
-        mock_serial = MockSerial([response])
-        mock_serial_class.return_value = mock_serial
+        response = ACK_OK
+        mock_serial.reset([response])
 
         t = Transport("/dev/ttyACM0")
         resp = t.finish_update()
 
         assert resp.is_ok is True
 
-    @patch('crispy_protocol.transport.serial.Serial')
-    @patch('crispy_protocol.transport.time.sleep')
-    def test_finish_update_crc_error(self, mock_sleep, mock_serial_class):
+    def test_finish_update_crc_error(self, mock_serial):
         """finish_update handles CRC error."""
-        response = make_ack_response(AckStatus.CRC_ERROR)
-        mock_serial = MockSerial([response])
-        mock_serial_class.return_value = mock_serial
+        response = ACK_CRC_ERROR
+        mock_serial.reset([response])
 
         t = Transport("/dev/ttyACM0")
         resp = t.finish_update()
@@ -323,13 +391,10 @@ class TestTransportFinishUpdate:
 class TestTransportReboot:
     """Tests for reboot method."""
 
-    @patch('crispy_protocol.transport.serial.Serial')
-    @patch('crispy_protocol.transport.time.sleep')
-    def test_reboot_success(self, mock_sleep, mock_serial_class):
+    def test_reboot_success(self, mock_serial):
         """reboot returns AckResponse."""
-        response = make_ack_response(AckStatus.OK)
-        mock_serial = MockSerial([response])
-        mock_serial_class.return_value = mock_serial
+        response = ACK_OK
+        mock_serial.reset([response])
 
         t = Transport("/dev/ttyACM0")
         resp = t.reboot()
@@ -340,12 +405,9 @@ class TestTransportReboot:
 class TestTransportReceive:
     """Tests for _receive method."""
 
-    @patch('crispy_protocol.transport.serial.Serial')
-    @patch('crispy_protocol.transport.time.sleep')
-    def test_receive_timeout(self, mock_sleep, mock_serial_class):
+    def test_receive_timeout(self, mock_serial):
         """_receive raises TimeoutError on timeout."""
-        mock_serial = MockSerial([])  # No responses
-        mock_serial_class.return_value = mock_serial
+        mock_serial.reset([])  # No responses
 
         t = Transport("/dev/ttyACM0")
 
@@ -356,19 +418,16 @@ class TestTransportReceive:
 class TestTransportUploadFirmware:
     """Tests for upload_firmware method."""
 
-    @patch('crispy_protocol.transport.serial.Serial')
-    @patch('crispy_protocol.transport.time.sleep')
-    def test_upload_firmware_success(self, mock_sleep, mock_serial_class):
+    def test_upload_firmware_success(self, mock_serial):
         """upload_firmware completes successfully."""
         # Responses: start_update OK, data_block OK (x2), finish_update OK
         responses = [
-            make_ack_response(AckStatus.OK),  # start_update
-            make_ack_response(AckStatus.OK),  # data_block 1
-            make_ack_response(AckStatus.OK),  # data_block 2
-            make_ack_response(AckStatus.OK),  # finish_update
+            ACK_OK,  # start_update
+            ACK_OK,  # data_block 1
+            ACK_OK,  # data_block 2
+            ACK_OK,  # finish_update
         ]
-        mock_serial = MockSerial(responses)
-        mock_serial_class.return_value = mock_serial
+        mock_serial.reset(responses)
 
         t = Transport("/dev/ttyACM0")
 
@@ -376,80 +435,29 @@ class TestTransportUploadFirmware:
         t.upload_firmware(firmware, bank=0, version=1, chunk_size=1024)
         # Should complete without exception
 
-    @patch('crispy_protocol.transport.serial.Serial')
-    @patch('crispy_protocol.transport.time.sleep')
-    def test_upload_firmware_start_fails(self, mock_sleep, mock_serial_class):
-        """upload_firmware raises UploadError if start fails."""
-        responses = [make_ack_response(AckStatus.BANK_INVALID)]
-        mock_serial = MockSerial(responses)
-        mock_serial_class.return_value = mock_serial
-
-        t = Transport("/dev/ttyACM0")
-
-        with pytest.raises(UploadError, match="StartUpdate failed"):
-            t.upload_firmware(b"\xFF" * 100, bank=0, version=1)
-
-    @patch('crispy_protocol.transport.serial.Serial')
-    @patch('crispy_protocol.transport.time.sleep')
-    def test_upload_firmware_data_block_fails(self, mock_sleep, mock_serial_class):
-        """upload_firmware raises UploadError if data block fails."""
-        responses = [
-            make_ack_response(AckStatus.OK),  # start_update
-            make_ack_response(AckStatus.FLASH_ERROR),  # data_block fails
-        ]
-        mock_serial = MockSerial(responses)
-        mock_serial_class.return_value = mock_serial
-
-        t = Transport("/dev/ttyACM0")
-
-        with pytest.raises(UploadError, match="DataBlock failed"):
-            t.upload_firmware(b"\xFF" * 100, bank=0, version=1)
-
-    @patch('crispy_protocol.transport.serial.Serial')
-    @patch('crispy_protocol.transport.time.sleep')
-    def test_upload_firmware_finish_crc_error(self, mock_sleep, mock_serial_class):
-        """upload_firmware raises UploadError on CRC error."""
-        responses = [
-            make_ack_response(AckStatus.OK),  # start_update
-            make_ack_response(AckStatus.OK),  # data_block
-            make_ack_response(AckStatus.CRC_ERROR),  # finish_update
-        ]
-        mock_serial = MockSerial(responses)
-        mock_serial_class.return_value = mock_serial
-
-        t = Transport("/dev/ttyACM0")
-
-        with pytest.raises(UploadError, match="CRC verification failed"):
-            t.upload_firmware(b"\xFF" * 100, bank=0, version=1)
-
-    @patch('crispy_protocol.transport.serial.Serial')
-    @patch('crispy_protocol.transport.time.sleep')
-    def test_upload_firmware_finish_other_error(self, mock_sleep, mock_serial_class):
-        """upload_firmware raises UploadError on finish error."""
-        responses = [
-            make_ack_response(AckStatus.OK),  # start_update
-            make_ack_response(AckStatus.OK),  # data_block
-            make_ack_response(AckStatus.BAD_STATE),  # finish_update
-        ]
-        mock_serial = MockSerial(responses)
-        mock_serial_class.return_value = mock_serial
+    @pytest.mark.parametrize("responses,match", [
+        ([ACK_BANK_INVALID], "StartUpdate failed"),
+        ([ACK_OK, ACK_FLASH_ERROR], "DataBlock failed"),
+        ([ACK_OK, ACK_OK, ACK_CRC_ERROR], "CRC verification failed"),
+        ([ACK_OK, ACK_OK, ACK_BAD_STATE], "FinishUpdate failed"),
+    ], ids=["start-fails", "data-block-fails", "finish-crc-error", "finish-other"])
+    def test_upload_firmware_failures(self, mock_serial, responses, match):
+        """Each failing step surfaces as UploadError with its message."""
+        mock_serial.reset(responses)
 
         t = Transport("/dev/ttyACM0")
 
-        with pytest.raises(UploadError, match="FinishUpdate failed"):
+        with pytest.raises(UploadError, match=match):
             t.upload_firmware(b"\xFF" * 100, bank=0, version=1)
 
-    @patch('crispy_protocol.transport.serial.Serial')
-    @patch('crispy_protocol.transport.time.sleep')
-    def test_upload_firmware_with_progress(self, mock_sleep, mock_serial_class):
+    def test_upload_firmware_with_progress(self, mock_serial):
         """upload_firmware calls progress callback."""
         responses = [
-            make_ack_response(AckStatus.OK),  # start_update
-            make_ack_response(AckStatus.OK),  # data_block
-            make_ack_response(AckStatus.OK),  # finish_update
+            ACK_OK,  # start_update
+            ACK_OK,  # data_block
+            ACK_OK,  # finish_update
         ]
-        mock_serial = MockSerial(responses)
-        mock_serial_class.return_value = mock_serial
+        mock_serial.reset(responses)
 
         t = Transport("/dev/ttyACM0")
 
@@ -468,63 +476,29 @@ class TestTransportUploadFirmware:
 class TestTransportUploadFirmwareFile:
     """Tests for upload_firmware_file method."""
 
-    @patch('crispy_protocol.transport.serial.Serial')
-    @patch('crispy_protocol.transport.time.sleep')
-    def test_upload_firmware_file_success(self, mock_sleep, mock_serial_class, tmp_path):
+    def test_upload_firmware_file_success(self, mock_serial, tmp_path):
         """upload_firmware_file reads file and uploads."""
         responses = [
-            make_ack_response(AckStatus.OK),  # start_update
-            make_ack_response(AckStatus.OK),  # data_block
-            make_ack_response(AckStatus.OK),  # finish_update
+            ACK_OK,  # start_update
+            ACK_OK,  # data_block
+            ACK_OK,  # finish_update
         ]
-        mock_serial = MockSerial(responses)
-        mock_serial_class.return_value = mock_serial
+        mock_serial.reset(responses)
 
         # Create temp firmware file
         fw_path = tmp_path / "firmware.bin"
-        fw_data = b"\xDE\xAD\xBE\xEF" * 25
-        fw_path.write_bytes(fw_data)
+        fw_path.write_bytes(FW_DATA)
 
         t = Transport("/dev/ttyACM0")
         result_crc = t.upload_firmware_file(fw_path, bank=0, version=1)
 
-        assert result_crc == crc32(fw_data)
+        assert result_crc == FW_CRC
 
-    @patch('crispy_protocol.transport.serial.Serial')
-    @patch('crispy_protocol.transport.time.sleep')
-    def test_upload_firmware_file_not_found(self, mock_sleep, mock_serial_class, tmp_path):
+    def test_upload_firmware_file_not_found(self, mock_serial, tmp_path):
         """upload_firmware_file raises for missing file."""
-        mock_serial = MockSerial([])
-        mock_serial_class.return_value = mock_serial
+        mock_serial.reset([])
 
         t = Transport("/dev/ttyACM0")
 
         with pytest.raises(FileNotFoundError):
             t.upload_firmware_file(tmp_path / "nonexistent.bin", bank=0, version=1)
-
-
-class TestExceptions:
-    """Tests for exception classes."""
-
-    def test_transport_error_is_exception(self):
-        """TransportError inherits from Exception."""
-        assert issubclass(TransportError, Exception)
-
-    def test_timeout_error_is_transport_error(self):
-        """TimeoutError inherits from TransportError."""
-        assert issubclass(TimeoutError, TransportError)
-
-    def test_protocol_error_is_transport_error(self):
-        """ProtocolError inherits from TransportError."""
-        assert issubclass(ProtocolError, TransportError)
-
-    def test_upload_error_is_transport_error(self):
-        """UploadError inherits from TransportError."""
-        assert issubclass(UploadError, TransportError)
-
-    def test_exceptions_can_have_message(self):
-        """All exceptions can carry a message."""
-        assert str(TransportError("test")) == "test"
-        assert str(TimeoutError("timeout msg")) == "timeout msg"
-        assert str(ProtocolError("proto msg")) == "proto msg"
-        assert str(UploadError("upload msg")) == "upload msg"
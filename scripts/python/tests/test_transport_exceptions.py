@@ -0,0 +1,42 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2026 ADNT Sarl <info@adnt.io>
+
+"""Tests for transport exception classes.
+
+Kept apart from test_transport.py so these trivially fast checks don't
+share that module's serial/sleep patching fixtures.
+"""
+
+from crispy_protocol.transport import (
+    TransportError,
+    TimeoutError,
+    ProtocolError,
+    UploadError,
+)
+
+
+class TestExceptions:
+    """Tests for exception classes."""
+
+    def test_transport_error_is_exception(self):
+        """TransportError inherits from Exception."""
+        assert issubclass(TransportError, Exception)
+
+    def test_timeout_error_is_transport_error(self):
+        """TimeoutError inherits from TransportError."""
+        assert issubclass(TimeoutError, TransportError)
+
+    def test_protocol_error_is_transport_error(self):
+        """ProtocolError inherits from TransportError."""
+        assert issubclass(ProtocolError, TransportError)
+
+    def test_upload_error_is_transport_error(self):
+        """UploadError inherits from TransportError."""
+        assert issubclass(UploadError, TransportError)
+
+    def test_exceptions_can_have_message(self):
+        """All exceptions can carry a message."""
+        assert str(TransportError("test")) == "test"
+        assert str(TimeoutError("timeout msg")) == "timeout msg"
+        assert str(ProtocolError("proto msg")) == "proto msg"
+        assert str(UploadError("upload msg")) == "upload msg"